@@ -6,11 +6,17 @@ Uses Claude Code hooks (Stop, UserPromptSubmit) for response detection.
 
 import subprocess
 import sys
+import threading
 import time
 import argparse
 import re
 from pathlib import Path
 
+try:
+    from watchfiles import Change, watch  # type: ignore[import-not-found]
+except ImportError:
+    Change = watch = None  # Fall back to polling END_FILE
+
 # Response detection files (written by hooks)
 RESPONSE_FILE = Path("/tmp/csp-claude-response")
 START_FILE = Path("/tmp/csp-claude-start")
@@ -18,25 +24,74 @@ END_FILE = Path("/tmp/csp-claude-end")
 
 # Spinner characters
 SPINNER = ['|', '/', '—', '\\']
+_SPINNER_FRAMES = [f'\r  {c} ' for c in SPINNER]
+_SPINNER_CLEAR = '\r    \r'
+# Only animate when attached to a terminal (piped runs get no spinner noise)
+_TTY = sys.stdout.isatty()
+
+
+# Markdown patterns, compiled once per process
+_RE_BOLD_STAR = re.compile(r'\*\*(.+?)\*\*')
+_RE_BOLD_UND = re.compile(r'__(.+?)__')
+_RE_ITALIC_STAR = re.compile(r'\*(.+?)\*')
+_RE_ITALIC_UND = re.compile(r'(?<!\w)_(.+?)_(?!\w)')
+_RE_CODE = re.compile(r'`(.+?)`')
+_RE_HEADER = re.compile(r'^#{1,6}\s+', re.MULTILINE)
+_RE_LINK = re.compile(r'\[(.+?)\]\(.+?\)')
+
+# Characters that can start a markdown construct
+_MD_CHARS = '*_`[#'
 
 
 def strip_markdown(text: str) -> str:
     """Remove common markdown formatting."""
-    # Bold: **text** or __text__
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    text = re.sub(r'__(.+?)__', r'\1', text)
-    # Italic: *text* or _text_
-    text = re.sub(r'\*(.+?)\*', r'\1', text)
-    text = re.sub(r'(?<!\w)_(.+?)_(?!\w)', r'\1', text)
-    # Code: `text`
-    text = re.sub(r'`(.+?)`', r'\1', text)
-    # Headers: # text
-    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-    # Links: [text](url)
-    text = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', text)
+    if not any(c in text for c in _MD_CHARS):
+        return text
+    # Each pass is skipped when its delimiter does not occur at all
+    if '*' in text:
+        # Bold: **text**
+        text = _RE_BOLD_STAR.sub(r'\1', text)
+    if '_' in text:
+        # Bold: __text__
+        text = _RE_BOLD_UND.sub(r'\1', text)
+    if '*' in text:
+        # Italic: *text*
+        text = _RE_ITALIC_STAR.sub(r'\1', text)
+    if '_' in text:
+        # Italic: _text_
+        text = _RE_ITALIC_UND.sub(r'\1', text)
+    if '`' in text:
+        # Code: `text`
+        text = _RE_CODE.sub(r'\1', text)
+    if '#' in text:
+        # Headers: # text
+        text = _RE_HEADER.sub('', text)
+    if '[' in text:
+        # Links: [text](url)
+        text = _RE_LINK.sub(r'\1', text)
     return text
 
 
+def _watch_end_file(ended: threading.Event, stop: threading.Event):
+    """Set `ended` as soon as the Stop hook writes END_FILE (inotify/FSEvents)."""
+    try:
+        for _ in watch(
+            str(END_FILE.parent),
+            watch_filter=lambda change, path: (
+                change != Change.deleted and path.endswith(END_FILE.name)
+            ),
+            # Yield 10ms after the write; the default 50ms step would be no
+            # faster than the 100ms poll it is meant to beat
+            step=10,
+            stop_event=stop,
+            recursive=False,
+        ):
+            ended.set()
+            return
+    except Exception:
+        pass  # Watcher is only a latency optimisation; polling still runs
+
+
 class ClaudeChatMonitor:
     """Monitors Claude responses via hook-written files."""
 
@@ -53,13 +108,14 @@ class ClaudeChatMonitor:
         # Record current time as our reference point
         self.send_time = time.time()
 
-        # Send to Claude via tmux
-        subprocess.run(
-            ['tmux', 'send-keys', '-t', self.pane_id, '-l', message],
-            check=True, capture_output=True
-        )
+        # tmux treats a trailing ';' on an argument as a command separator
+        if message.endswith(';'):
+            message = message[:-1] + '\\;'
+
+        # Send to Claude via tmux: literal text then Enter, chained in one process
         subprocess.run(
-            ['tmux', 'send-keys', '-t', self.pane_id, 'Enter'],
+            ['tmux', 'send-keys', '-t', self.pane_id, '-l', message,
+             ';', 'send-keys', '-t', self.pane_id, 'Enter'],
             check=True, capture_output=True
         )
 
@@ -69,18 +125,30 @@ class ClaudeChatMonitor:
         start_time = time.time()
         spinner_idx = 0
 
+        # Wake the wait below as soon as END_FILE appears instead of on the next tick
+        ended = threading.Event()
+        stop_watch = threading.Event()
+        watcher = None
+        if watch is not None:
+            watcher = threading.Thread(
+                target=_watch_end_file, args=(ended, stop_watch), daemon=True
+            )
+            watcher.start()
+
         try:
             while time.time() - start_time < timeout:
                 # Update spinner
-                sys.stdout.write(f'\r  {SPINNER[spinner_idx]} ')
-                sys.stdout.flush()
-                spinner_idx = (spinner_idx + 1) % len(SPINNER)
+                if _TTY:
+                    sys.stdout.write(_SPINNER_FRAMES[spinner_idx])
+                    sys.stdout.flush()
+                spinner_idx = (spinner_idx + 1) % len(_SPINNER_FRAMES)
 
                 # Check if end file exists (we deleted it before sending)
                 if END_FILE.exists():
                     # Clear spinner line
-                    sys.stdout.write('\r    \r')
-                    sys.stdout.flush()
+                    if _TTY:
+                        sys.stdout.write(_SPINNER_CLEAR)
+                        sys.stdout.flush()
 
                     # Stop hook has fired, check for response
                     if RESPONSE_FILE.exists():
@@ -95,14 +163,20 @@ class ClaudeChatMonitor:
                             return response
                     return None
 
-                time.sleep(0.1)
+                ended.wait(0.1)
         except KeyboardInterrupt:
             # User pressed Ctrl+C to cancel
             pass
+        finally:
+            stop_watch.set()
+            if watcher is not None:
+                # Let the watcher leave native code before we return
+                watcher.join(timeout=1)
 
         # Clear spinner on timeout or cancel
-        sys.stdout.write('\r    \r')
-        sys.stdout.flush()
+        if _TTY:
+            sys.stdout.write(_SPINNER_CLEAR)
+            sys.stdout.flush()
         return None
 
 
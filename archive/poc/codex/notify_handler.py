@@ -12,21 +12,34 @@ Codex sends JSON like:
 }
 """
 
+import os
 import sys
 import json
 import time
 from pathlib import Path
 
+try:
+    import orjson  # type: ignore[import-not-found]
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Output files
 RESPONSE_FILE = Path("/tmp/csp-codex-response")
 END_FILE = Path("/tmp/csp-codex-end")
 LOG_FILE = Path("/tmp/csp-codex-notify.log")
 
 
+# Log fd is opened once per process and reused; the OS closes it on exit
+_log_fd: int | None = None
+
+
 def log(message: str):
     """Append to log file for debugging."""
-    with open(LOG_FILE, 'a') as f:
-        f.write(f"{time.time()}: {message}\n")
+    global _log_fd
+    if _log_fd is None:
+        _log_fd = os.open(LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    os.write(_log_fd, f"{time.time()}: {message}\n".encode())
 
 
 def main():
@@ -36,27 +49,34 @@ def main():
         return
 
     json_str = sys.argv[-1]
-    log(f"Received: {json_str[:200]}...")
+
+    # Cheap substring check before parsing - other notify events are
+    # dropped silently, without touching the log
+    if '"agent-turn-complete"' not in json_str:
+        return
 
     try:
-        payload = json.loads(json_str)
+        payload = _loads(json_str)
 
         event_type = payload.get("type", "")
-        log(f"Event type: {event_type}")
+        if event_type != "agent-turn-complete":
+            log(f"Skipped event type: {event_type}")
+            return
 
-        if event_type == "agent-turn-complete":
-            response = payload.get("last-assistant-message", "")
+        response = payload.get("last-assistant-message", "")
+        if response:
+            RESPONSE_FILE.write_text(response)
+            status = f"Wrote response ({len(response)} chars)"
+        else:
+            status = "No response in payload"
 
-            if response:
-                RESPONSE_FILE.write_text(response)
-                log(f"Wrote response ({len(response)} chars)")
-            else:
-                log("No response in payload")
+        END_FILE.write_text(str(int(time.time())))
 
-            END_FILE.write_text(str(int(time.time())))
-            log("Wrote end marker")
+        # Single log write per notify instead of one per step
+        log(f"Received: {json_str[:200]}... | {status} | Wrote end marker")
 
     except json.JSONDecodeError as e:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
         log(f"JSON decode error: {e}")
     except Exception as e:
         log(f"Error: {e}")
@@ -4,8 +4,11 @@ CSP POC - Gemini Chat UI
 Uses Gemini's local telemetry file to detect response completion.
 """
 
+import os
+import queue
 import subprocess
 import sys
+import threading
 import time
 import argparse
 import json
@@ -13,6 +16,17 @@ import re
 from pathlib import Path
 from typing import Optional
 
+try:
+    from watchfiles import Change, watch  # type: ignore[import-not-found]
+except ImportError:
+    Change = watch = None  # Fall back to polling the telemetry file
+
+try:
+    import orjson  # type: ignore[import-not-found]
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Telemetry file location (configured in ~/.gemini/settings.json)
 TELEMETRY_FILE = Path("/tmp/csp-gemini-telemetry.log")
 
@@ -21,80 +35,243 @@ START_FILE = Path("/tmp/csp-gemini-start")
 END_FILE = Path("/tmp/csp-gemini-end")
 RESPONSE_FILE = Path("/tmp/csp-gemini-response")
 
+# Messages longer than this are pasted from a tmux buffer, not typed
+PASTE_MIN_CHARS = 200
+PASTE_BUFFER = 'csp-send'
+
 # Spinner characters
 SPINNER = ['|', '/', '—', '\\']
 
 
+# Most telemetry bytes kept for scanning; older records are dropped
+_MAX_SCAN = 4 * 1024 * 1024
+
+# Event name marking a completed model response in the telemetry log
+_MARKER_RESPONSE = b'"gemini_cli.api_response"'
+
+# Key of the escaped JSON payload in telemetry api_response records
+_RESPONSE_TEXT_KEY = b'"response_text":'
+
+
+def _json_string_body(buf, start: int) -> bytes | None:
+    """Return the still-escaped body of the JSON string value at buf[start:].
+
+    `start` points just past a `"key":`. Whitespace is skipped, then the
+    closing quote is found with bytes.find, skipping quotes preceded by an
+    odd number of backslashes. Returns None if the string is unterminated.
+    """
+    n = len(buf)
+    while start < n and buf[start] in b' \t\r\n':
+        start += 1
+    if start >= n or buf[start] != 0x22:  # '"'
+        return None
+    body_start = start + 1
+    pos = body_start
+    while True:
+        quote = buf.find(b'"', pos)
+        if quote < 0:
+            return None
+        slashes = 0
+        while buf[quote - 1 - slashes] == 0x5C:  # '\\'
+            slashes += 1
+        if slashes % 2 == 0:
+            return bytes(buf[body_start:quote])
+        pos = quote + 1
+
+
+# Gemini UI chrome to drop when scraping the pane, matched in one pass
+_SKIP_MARKERS = (
+    'gemini>', '/help', '/find-docs', 'shift+tab',
+    'press enter', 'type /', 'authenticate', 'skip the next'
+)
+_SKIP_RE = re.compile('|'.join(map(re.escape, _SKIP_MARKERS)), re.IGNORECASE)
+
+# Characters that can start a markdown construct
+_MD_CHARS = '*_`[#'
+
+# Markdown patterns, compiled once per process
+_RE_BOLD_STAR = re.compile(r'\*\*(.+?)\*\*')
+_RE_BOLD_UND = re.compile(r'__(.+?)__')
+_RE_ITALIC_STAR = re.compile(r'\*(.+?)\*')
+_RE_ITALIC_UND = re.compile(r'(?<!\w)_(.+?)_(?!\w)')
+_RE_CODE = re.compile(r'`(.+?)`')
+_RE_HEADER = re.compile(r'^#{1,6}\s+', re.MULTILINE)
+_RE_LINK = re.compile(r'\[(.+?)\]\(.+?\)')
+
+
 def strip_markdown(text: str) -> str:
     """Remove common markdown formatting."""
-    # Bold: **text** or __text__
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-    text = re.sub(r'__(.+?)__', r'\1', text)
-    # Italic: *text* or _text_
-    text = re.sub(r'\*(.+?)\*', r'\1', text)
-    text = re.sub(r'(?<!\w)_(.+?)_(?!\w)', r'\1', text)
-    # Code: `text`
-    text = re.sub(r'`(.+?)`', r'\1', text)
-    # Headers: # text
-    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-    # Links: [text](url)
-    text = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', text)
+    # Each pass is skipped when its delimiter does not occur at all
+    if '*' in text:
+        # Bold: **text**
+        text = _RE_BOLD_STAR.sub(r'\1', text)
+    if '_' in text:
+        # Bold: __text__
+        text = _RE_BOLD_UND.sub(r'\1', text)
+    if '*' in text:
+        # Italic: *text*
+        text = _RE_ITALIC_STAR.sub(r'\1', text)
+    if '_' in text:
+        # Italic: _text_
+        text = _RE_ITALIC_UND.sub(r'\1', text)
+    if '`' in text:
+        # Code: `text`
+        text = _RE_CODE.sub(r'\1', text)
+    if '#' in text:
+        # Headers: # text
+        text = _RE_HEADER.sub('', text)
+    if '[' in text:
+        # Links: [text](url)
+        text = _RE_LINK.sub(r'\1', text)
     return text
 
 
+def _watch_telemetry(changed: threading.Event, stop: threading.Event):
+    """Set `changed` whenever Gemini appends to the telemetry log (inotify/FSEvents)."""
+    try:
+        for _ in watch(
+            str(TELEMETRY_FILE.parent),
+            watch_filter=lambda change, path: (
+                change != Change.deleted and path.endswith(TELEMETRY_FILE.name)
+            ),
+            # Bound grouping so a steady stream of writes still wakes us quickly
+            debounce=200,
+            step=20,
+            stop_event=stop,
+            recursive=False,
+        ):
+            changed.set()
+    except Exception:
+        pass  # Watcher is only a latency optimisation; the 500ms poll remains
+
+
+def _spin(done: threading.Event):
+    """Redraw the wait spinner every 100ms, clearing it once done is set."""
+    i = 0
+    while not done.is_set():
+        sys.stdout.write(f'\r  {SPINNER[i % len(SPINNER)]} ')
+        sys.stdout.flush()
+        i += 1
+        done.wait(0.1)
+    sys.stdout.write('\r    \r')
+    sys.stdout.flush()
+
+
 class GeminiTelemetryParser:
-    """Parses Gemini telemetry for response detection."""
+    """Parses Gemini telemetry for response detection.
+
+    The telemetry log only grows, so instead of re-reading it on every poll
+    we remember the byte offset at send time and only read what was
+    appended since. All scanning is done on that tail.
+    """
 
     def __init__(self):
-        self.last_prompt_count = 0
-        self.last_response_count = 0
+        self._fd = None
+        self._offset = 0
+        self._tail = bytearray()
+
+    def _open(self) -> bool:
+        """Lazily open the telemetry file (it may not exist at startup)."""
+        if self._fd is None:
+            try:
+                self._fd = os.open(TELEMETRY_FILE, os.O_RDONLY)
+            except OSError:
+                return False
+        return True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read_new(self):
+        """Append any bytes written since the last read to the tail buffer.
+
+        A single fstat tells whether the file grew; only then is the new
+        range read with pread. A file smaller than our offset was truncated
+        or replaced, so it is reopened and read from the start.
+        """
+        if not self._open():
+            return
+        size = os.fstat(self._fd).st_size
+        if size < self._offset:
+            self.close()
+            self._offset = 0
+            self._tail = bytearray()
+            if not self._open():
+                return
+            size = os.fstat(self._fd).st_size
+        if size == self._offset:
+            return
+        # Never read or keep more than the last _MAX_SCAN bytes, trimmed to
+        # start at a record boundary (one extra byte shows if we are on one)
+        start = max(self._offset, size - _MAX_SCAN - 1)
+        if start > self._offset:
+            self._tail = bytearray()  # Everything buffered is older
+        data = os.pread(self._fd, size - start, start)
+        self._offset = start + len(data)
+        self._tail += data
+        excess = len(self._tail) - _MAX_SCAN
+        if excess > 0:
+            newline = self._tail.find(b'\n', excess - 1)
+            del self._tail[:newline + 1 if newline >= 0 else len(self._tail)]
+
+    def _replaced(self) -> bool:
+        """True if TELEMETRY_FILE no longer names the file we hold open."""
+        try:
+            path_stat = os.stat(TELEMETRY_FILE)
+        except OSError:
+            return True  # Deleted; not recreated yet
+        held = os.fstat(self._fd)
+        return (path_stat.st_ino, path_stat.st_dev) != (held.st_ino, held.st_dev)
 
     def reset_position(self):
         """Reset to current state before sending a message."""
-        if TELEMETRY_FILE.exists():
-            try:
-                content = TELEMETRY_FILE.read_text()
-                self.last_prompt_count = content.count('"gemini_cli.user_prompt"')
-                self.last_response_count = content.count('"gemini_cli.api_response"')
-            except Exception:
-                self.last_prompt_count = 0
-                self.last_response_count = 0
+        self._tail = bytearray()
+        # A log deleted and recreated may already be larger than our offset,
+        # so the size check in _read_new would never notice; compare inodes
+        if self._fd is not None and self._replaced():
+            self.close()
+        if self._open():
+            self._offset = os.fstat(self._fd).st_size
+        else:
+            self._offset = 0
 
     def has_new_response(self) -> bool:
         """Check if a new api_response event appeared after our prompt."""
-        if not TELEMETRY_FILE.exists():
-            return False
-
         try:
-            content = TELEMETRY_FILE.read_text()
-            current_response_count = content.count('"gemini_cli.api_response"')
-            return current_response_count > self.last_response_count
+            self._read_new()
+            return _MARKER_RESPONSE in self._tail
         except Exception:
             return False
 
     def extract_last_response(self) -> Optional[str]:
         """Extract the last response text from api_response events."""
-        if not TELEMETRY_FILE.exists():
-            return None
-
         try:
-            content = TELEMETRY_FILE.read_text()
-
-            # Find all response_text values
-            pattern = r'"response_text":\s*"((?:[^"\\]|\\.)*)"'
-            matches = re.findall(pattern, content)
-
-            if not matches:
-                return None
-
-            # Get the last response_text (most recent)
-            response_json_str = matches[-1]
-
-            # Unescape the JSON string
-            response_json_str = response_json_str.encode().decode('unicode_escape')
+            self._read_new()
+
+            # Locate the last (most recent) response_text from the end of the
+            # tail rather than matching every occurrence; skip back past a
+            # record that is still being written
+            end = len(self._tail)
+            while True:
+                idx = self._tail.rfind(_RESPONSE_TEXT_KEY, 0, end)
+                if idx < 0:
+                    return None
+                response_json_str = _json_string_body(
+                    self._tail, idx + len(_RESPONSE_TEXT_KEY)
+                )
+                if response_json_str is not None:
+                    break
+                end = idx
+
+            # The body is a JSON string literal minus its quotes; decoding it
+            # as one unescapes it in C, including surrogate pairs, and keeps
+            # non-ASCII text written unescaped by Gemini intact
+            response_json_str = _loads(b'"' + response_json_str + b'"')
 
             # Parse the response JSON
-            response_data = json.loads(response_json_str)
+            response_data = _loads(response_json_str)
 
             # Handle both streaming (list) and single responses
             text_parts = []
@@ -115,6 +292,80 @@ class GeminiTelemetryParser:
             return None
 
 
+def _tmux_quote(value: str) -> str:
+    """Quote a value for the tmux command parser (single quotes, no expansion)."""
+    return "'" + value.replace("'", "'\\''") + "'"
+
+
+class TmuxControlClient:
+    """Persistent `tmux -C` connection so commands don't fork a process each.
+
+    Each command written to stdin is answered by a %begin/%end (or %error)
+    block; a reader thread collects those blocks so run() can wait for the
+    result of what it sent.
+    """
+
+    def __init__(self, target: str, timeout: float = 2.0):
+        self._proc = subprocess.Popen(
+            ['tmux', '-C', 'attach-session', '-f', 'ignore-size,no-output', '-t', target],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            # Default block buffering; run() flushes once per batch of commands
+            text=True, bufsize=-1
+        )
+        self._ready = threading.Event()
+        self._blocks: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._alive = True
+        threading.Thread(target=self._read, daemon=True).start()
+        if not self._ready.wait(timeout) or not self._alive:
+            self.close()
+            raise RuntimeError("tmux control mode did not attach")
+
+    def _read(self):
+        """Collect command output blocks; ignore async notifications."""
+        block = None
+        for line in self._proc.stdout:
+            line = line.rstrip('\n')
+            if block is None:
+                if line.startswith('%session-changed'):
+                    self._ready.set()
+                elif line.startswith('%begin'):
+                    block = []
+            elif line.startswith(('%end', '%error')):
+                # The attach command's own block arrives before we are ready
+                if self._ready.is_set():
+                    self._blocks.put((line.startswith('%end'), block))
+                block = None
+            else:
+                block.append(line)
+        # Connection closed: fail pending run() calls and any waiting attach
+        self._alive = False
+        self._blocks.put(None)
+        self._ready.set()
+
+    def run(self, *commands: str) -> list[str]:
+        """Run tmux commands and return the output lines of the last one."""
+        with self._lock:
+            self._proc.stdin.write(''.join(f"{cmd}\n" for cmd in commands))
+            self._proc.stdin.flush()
+            output: list[str] = []
+            for cmd in commands:
+                result = self._blocks.get(timeout=5)
+                if result is None:
+                    raise BrokenPipeError("tmux control client exited")
+                ok, output = result
+                if not ok:
+                    raise RuntimeError(f"tmux command failed: {cmd}: {' '.join(output)}")
+            return output
+
+    def close(self):
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=1)
+        except Exception:
+            self._proc.kill()
+
+
 class GeminiChatMonitor:
     """Monitors Gemini responses via telemetry file."""
 
@@ -122,6 +373,47 @@ class GeminiChatMonitor:
         self.pane_id = pane_id
         self.parser = GeminiTelemetryParser()
         self.send_time = 0.0
+        # Prefer one persistent tmux connection; fall back to spawning tmux
+        self._tmux: TmuxControlClient | None = None
+        self._tmux_usable = True
+        self._connect_tmux()
+
+    def _connect_tmux(self):
+        """Open the control connection, or give up on control mode."""
+        try:
+            self._tmux = TmuxControlClient(self.pane_id)
+        except (OSError, RuntimeError):
+            self._tmux = None
+            self._tmux_usable = False
+
+    def close(self):
+        """Close the persistent tmux connection and the telemetry file."""
+        self._tmux_usable = False
+        if self._tmux is not None:
+            self._tmux.close()
+            self._tmux = None
+        self.parser.close()
+
+    def _tmux_run(self, *commands: str) -> list[str] | None:
+        """Run commands over the control connection.
+
+        Returns None if there is no usable connection, so the caller can
+        fall back to spawning tmux.
+        """
+        if self._tmux is None:
+            if not self._tmux_usable:
+                return None
+            # The last connection broke; respawn it
+            self._connect_tmux()
+            if self._tmux is None:
+                return None
+        try:
+            return self._tmux.run(*commands)
+        except (OSError, RuntimeError, queue.Empty):
+            # Drop only this connection; the telemetry parser stays open
+            self._tmux.close()
+            self._tmux = None
+            return None
 
     def send_message(self, message: str):
         """Send a message to the Gemini pane."""
@@ -135,46 +427,96 @@ class GeminiChatMonitor:
         # Reset telemetry parser to current state
         self.parser.reset_position()
 
-        # Exit shell mode with Escape
-        for _ in range(3):
-            subprocess.run(
-                ['tmux', 'send-keys', '-t', self.pane_id, 'Escape'],
-                check=True, capture_output=True
-            )
-            time.sleep(0.1)
-
         # Strip ! characters to prevent shell mode trigger in Gemini
         safe_message = message.replace('!', '')
 
-        # Send to Gemini via tmux
-        subprocess.run(
-            ['tmux', 'send-keys', '-t', self.pane_id, '-l', safe_message],
-            check=True, capture_output=True
-        )
+        self._exit_shell_mode()
+        target = _tmux_quote(self.pane_id)
+
+        # Long input: hand tmux the whole text in one buffer and paste it
+        # (bracketed, so embedded newlines don't submit early)
+        if len(safe_message) > PASTE_MIN_CHARS:
+            subprocess.run(
+                ['tmux', 'load-buffer', '-b', PASTE_BUFFER, '-'],
+                input=safe_message.encode(), check=True, capture_output=True
+            )
+            if self._tmux_run(
+                f"paste-buffer -d -p -b {PASTE_BUFFER} -t {target}",
+                f"send-keys -t {target} Enter",
+            ) is None:
+                subprocess.run(
+                    ['tmux', 'paste-buffer', '-d', '-p', '-b', PASTE_BUFFER,
+                     '-t', self.pane_id, ';', 'send-keys', '-t', self.pane_id, 'Enter'],
+                    check=True, capture_output=True
+                )
+            return
+
+        # Control mode is line based, so multi-line text goes via subprocess
+        if '\n' not in safe_message:
+            if self._tmux_run(
+                f"send-keys -t {target} -l {_tmux_quote(safe_message)}",
+                f"send-keys -t {target} Enter",
+            ) is not None:
+                return
+
+        # tmux treats a trailing ';' on an argument as a command separator
+        if safe_message.endswith(';'):
+            safe_message = safe_message[:-1] + '\\;'
+
+        # Send to Gemini via tmux: literal text then Enter, chained in one process
         subprocess.run(
-            ['tmux', 'send-keys', '-t', self.pane_id, 'Enter'],
+            ['tmux', 'send-keys', '-t', self.pane_id, '-l', safe_message,
+             ';', 'send-keys', '-t', self.pane_id, 'Enter'],
             check=True, capture_output=True
         )
 
+    def _exit_shell_mode(self):
+        """Press Escape to leave Gemini's shell mode, then let it settle."""
+        if self._tmux_run(
+            f"send-keys -t {_tmux_quote(self.pane_id)} Escape Escape Escape"
+        ) is None:
+            subprocess.run(
+                ['tmux', 'send-keys', '-t', self.pane_id, 'Escape', 'Escape', 'Escape'],
+                check=True, capture_output=True
+            )
+        time.sleep(0.1)
+
     def wait_for_response(self, timeout: float = 300.0) -> str | None:
         """Wait for Gemini to respond with spinner, return the response text.
         Press Ctrl+C to cancel waiting."""
-        start_time = time.time()
-        spinner_idx = 0
+        deadline = time.monotonic() + timeout
+
+        # Telemetry is re-checked every 500ms; a watcher wakes the check as
+        # soon as the file changes. The spinner runs on its own thread so
+        # telemetry reads never stall the animation.
+        watching = watch is not None
+        changed = threading.Event()
+        stop_watch = threading.Event()
+        watcher = None
+        if watching:
+            changed.set()  # Check once in case Gemini already answered
+            watcher = threading.Thread(
+                target=_watch_telemetry, args=(changed, stop_watch), daemon=True
+            )
+            watcher.start()
+        done = threading.Event()
+        spinner = threading.Thread(target=_spin, args=(done,), daemon=True)
+        spinner.start()
 
         try:
-            while time.time() - start_time < timeout:
-                # Update spinner
-                sys.stdout.write(f'\r  {SPINNER[spinner_idx]} ')
-                sys.stdout.flush()
-                spinner_idx = (spinner_idx + 1) % len(SPINNER)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                if watching:
+                    # Fall back to the 500ms poll in case the watcher died or
+                    # missed a write made before it was registered
+                    changed.wait(min(remaining, 0.5))
+                    changed.clear()
 
                 # Check if new api_response event appeared
                 if self.parser.has_new_response():
-                    # Clear spinner
-                    sys.stdout.write('\r    \r')
-                    sys.stdout.flush()
-
                     # Extract response from telemetry
                     response = self.parser.extract_last_response()
                     if response:
@@ -185,13 +527,17 @@ class GeminiChatMonitor:
                     if response:
                         return response
 
-                time.sleep(0.2)
+                if not watching:
+                    time.sleep(min(0.5, remaining))
         except KeyboardInterrupt:
             pass
-
-        # Clear spinner on timeout or cancel
-        sys.stdout.write('\r    \r')
-        sys.stdout.flush()
+        finally:
+            stop_watch.set()
+            done.set()
+            spinner.join()
+            if watcher is not None:
+                # Let the watcher leave native code before we return
+                watcher.join(timeout=1)
 
         # Last attempt: capture from pane
         return self._capture_pane_response()
@@ -199,26 +545,26 @@ class GeminiChatMonitor:
     def _capture_pane_response(self) -> Optional[str]:
         """Fallback: capture response from tmux pane."""
         try:
-            result = subprocess.run(
-                ['tmux', 'capture-pane', '-t', self.pane_id, '-p', '-S', '-50'],
-                capture_output=True, text=True, timeout=5
+            lines = self._tmux_run(
+                f"capture-pane -t {_tmux_quote(self.pane_id)} -p -S -50"
             )
-            if result.returncode == 0:
-                content = result.stdout.strip()
-                lines = content.split('\n')
-                response_lines = []
-                for line in lines:
-                    stripped = line.strip()
-                    if any(p in stripped.lower() for p in [
-                        'gemini>', '/help', '/find-docs', 'shift+tab',
-                        'press enter', 'type /', 'authenticate', 'skip the next'
-                    ]):
-                        continue
-                    if stripped and not stripped.startswith('>'):
-                        response_lines.append(stripped)
-
-                if response_lines:
-                    return '\n'.join(response_lines[-20:])
+            if lines is None:
+                result = subprocess.run(
+                    ['tmux', 'capture-pane', '-t', self.pane_id, '-p', '-S', '-50'],
+                    capture_output=True, text=True, timeout=5
+                )
+                if result.returncode != 0:
+                    return None
+                lines = result.stdout.strip().split('\n')
+            response_lines = []
+            for line in lines:
+                stripped = line.strip()
+                if not stripped or stripped.startswith('>') or _SKIP_RE.search(stripped):
+                    continue
+                response_lines.append(stripped)
+
+            if response_lines:
+                return '\n'.join(response_lines[-20:])
         except Exception:
             pass
         return None
@@ -265,9 +611,13 @@ def main():
             response = monitor.wait_for_response(timeout=300)
 
             if response:
-                clean = strip_markdown(response)
-                display = ' '.join(clean.split())
-                if len(display) > 300:
+                if any(c in response for c in _MD_CHARS):
+                    clean = strip_markdown(response)
+                else:
+                    clean = response
+                # Only the first 300 collapsed chars are shown, so bound the split
+                display = ' '.join(clean[:2000].split())
+                if len(display) > 300 or len(clean) > 2000:
                     display = display[:300] + "..."
                 print(f"Gemini > {display}")
             else:
@@ -277,6 +627,8 @@ def main():
 
     except KeyboardInterrupt:
         print("\n")
+    finally:
+        monitor.close()
 
     print("Goodbye!")
 
@@ -14,18 +14,24 @@ Features:
 
 import os
 import pty
-import select
+import selectors
 import sys
 import termios
 import tty
 import fcntl
 import struct
 import signal
+import socket
+import queue
 import threading
+import random
 import time
 import requests  # type: ignore[import-untyped]
+from requests.adapters import HTTPAdapter  # type: ignore[import-untyped]
+import urllib3
 import json
 import argparse
+import codecs
 import collections
 import re
 import websocket  # type: ignore[import-untyped]
@@ -33,16 +39,94 @@ import urllib.parse
 import subprocess
 import shutil
 from datetime import datetime
+from typing import Optional
+
+try:
+    import orjson  # type: ignore[import-not-found]
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _loads = json.loads
+
+# Headers for request bodies serialized with _dumps
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 # Configuration
 GATEWAY_URL = "http://localhost:8765"
 POLL_INTERVAL = 0.1
+INBOX_LONG_POLL_WAIT = 1  # seconds the gateway may hold an empty inbox poll
+WS_RETRY_INTERVAL = 30  # seconds of HTTP polling between WebSocket retries
+PTY_READ_SIZE = 65536  # bytes per read from the PTY or stdin
+SELECT_IDLE_TIMEOUT = 1.0  # seconds, main loop wait when nothing is queued
 STREAM_FLUSH_INTERVAL = 0.2  # seconds
-STREAM_CHUNK_THRESHOLD = 512  # characters
-STREAM_MAX_BUFFER = 8192      # characters
+STREAM_CHUNK_THRESHOLD = 512  # bytes of clean output
+STREAM_MAX_BUFFER = 8192      # bytes of clean output
+STREAM_QUEUE_SIZE = 64        # flushed chunks waiting for the sender thread
+STREAM_BATCH_MAX = 16         # chunks coalesced into one POST
+STREAM_BATCH_WAIT = 0.02      # seconds to wait for a second chunk
+FLOW_TAIL_SIZE = 200          # bytes of recent output kept for prompt detection
+FLOW_STATUS_INTERVAL = 0.5    # seconds between "N queued" status lines
+WS_RECONNECT_BASE_DELAY = 0.2  # seconds, first reconnect backoff
+WS_RECONNECT_MAX_DELAY = 10    # seconds, backoff cap
+WS_PING_INTERVAL = 20          # seconds between keepalive pings
+WS_PING_TIMEOUT = 10           # seconds to wait for the pong
+COMMAND_CACHE_TTL = 1.0        # seconds a @query.log / @mode.status result is reused
 INJECTION_TIMEOUT = float(os.environ.get('CSP_INJECTION_TIMEOUT', '0.5'))  # seconds, configurable
 
 
+# Fixed parts of "[YOUR TURN] [From <sender>]: <content>" injections
+_INJ_TURN = b"[YOUR TURN] "
+_INJ_FROM = b"[From "
+_INJ_SEP = b"]: "
+
+
+def _write_all(fd: int, data: bytes):
+    """os.write until every byte is out (large reads can be written partially)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+# All @-commands fused into one pattern; the outer group name is the command
+# type, so a single finditer pass over the clean bytes finds and classifies them.
+# Separators are [^\S\n] so, like the old per-line patterns, no command
+# spans a line break.
+_COMMAND_RE = re.compile(
+    # @query.log [limit] [from=X] [to=Y]
+    rb'(?P<query_log>@query\.log(?:[^\S\n]+(?P<limit>\d+))?(?:[^\S\n]+from=(?P<from>[^\s]+))?(?:[^\S\n]+to=(?P<to>[^\s]+))?)'
+    # @send.agent-name message (allows dashes)
+    rb'|(?P<send_agent>@send\.(?P<target>[\w-]+)[^\S\n]+(?P<message>.+))'
+    # @all message
+    rb'|(?P<send_all>@all[^\S\n]+(?P<all_message>.+))'
+    # Orchestrator commands (Phase 6)
+    rb'|(?P<mode_set>@mode\.set[^\S\n]+(?P<mode>\w+)[^\S\n]+"(?P<topic>[^"\n]+)"(?:[^\S\n]+--rounds[^\S\n]+(?P<rounds>\d+))?)'
+    rb'|(?P<mode_status>@mode\.status)'
+    # S3: NOOP command for orchestrator heartbeat responses
+    rb'|(?P<noop>^(?i:NOOP)[^\S\n]*$)'
+    # Turn timeout extension (explicit command only)
+    rb'|(?P<working>^[^\S\n]*(?:(?i:@working)|WORKING)\b(?P<note>.*)$)',
+    re.MULTILINE
+)
+
+# A NOOP line after the first one; the NOOP branch above only matches at a
+# line start, so these are the only places a case-insensitive NOOP can be
+_NOOP_LINE_RE = re.compile(rb'\n(?i:noop)')
+
+
+# Read-only @-commands whose results may be reused for COMMAND_CACHE_TTL
+_CACHED_COMMANDS = frozenset({'query_log', 'mode_status'})
+
+
+def _clock_time(timestamp: str) -> str:
+    """HH:MM:SS of an ISO 8601 timestamp such as the gateway's toISOString()."""
+    # Canonical "YYYY-MM-DDTHH:MM:SS..." is sliced; anything else is parsed
+    if len(timestamp) >= 19 and timestamp[10] == 'T' and timestamp[13] == ':' and timestamp[16] == ':':
+        return timestamp[11:19]
+    return datetime.fromisoformat(timestamp).strftime('%H:%M:%S')
+
+
 class AgentCommandProcessor:
     """Intercepts and handles @-commands in agent output (Phase 2 feature)"""
 
@@ -50,87 +134,79 @@ class AgentCommandProcessor:
         self.agent_id = agent_id
         self.gateway_url = gateway_url
         self.auth_token = auth_token
-        # Command pattern: @command.subcommand args... or @agent_name message
-        self.command_patterns = [
-            re.compile(r'@query\.log(?:\s+(\d+))?(?:\s+from=([^\s]+))?(?:\s+to=([^\s]+))?'),  # @query.log [limit] [from=X] [to=Y]
-            re.compile(r'@send\.([\w-]+)\s+(.+)'),  # @send.agent-name message (allows dashes)
-            re.compile(r'@all\s+(.+)'),  # @all message
-        ]
-        # Orchestrator command patterns (Phase 6)
-        self.mode_set_pattern = re.compile(
-            r'@mode\.set\s+(\w+)\s+"([^"]+)"(?:\s+--rounds\s+(\d+))?'
-        )
-        self.mode_status_pattern = re.compile(r'@mode\.status')
-        # S3: NOOP command for orchestrator heartbeat responses
-        self.noop_pattern = re.compile(r'^NOOP\s*$', re.IGNORECASE)
-        # Turn timeout extension (explicit command only)
-        self.working_at_pattern = re.compile(r'^\s*@working\b(.*)$', re.IGNORECASE)
-        self.working_bare_pattern = re.compile(r'^\s*WORKING\b(.*)$')
-
-    def detect_commands(self, text: str) -> list:
-        """Detect all @-commands in text. Returns list of (command_type, args)"""
-        commands = []
-        lines = text.split('\n')
-
-        for line in lines:
-            # Check for @query.log
-            match = self.command_patterns[0].search(line)
-            if match:
-                limit = int(match.group(1)) if match.group(1) else 50
-                from_agent = match.group(2)
-                to_agent = match.group(3)
-                commands.append(('query_log', {'limit': limit, 'from': from_agent, 'to': to_agent}))
-                continue
+        # Keep-alive session shared by all command round-trips
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
+        if auth_token:
+            self._http.headers["X-Auth-Token"] = auth_token
+        # (command_type, args) -> (monotonic time, result) for _CACHED_COMMANDS
+        self._result_cache = {}
+
+    def detect_commands(self, text: bytes) -> list:
+        """Detect all @-commands in clean output. Returns list of (command_type, args)"""
+        # Most output carries no command at all; plain substring checks rule
+        # that out before the regex scans every position of the chunk. '@'
+        # and WORKING are case-sensitive; only NOOP needs a case-insensitive
+        # look, and only at line starts, so the chunk is never copied
+        if b'@' not in text and b'WORKING' not in text:
+            if text[:4].lower() != b'noop' and _NOOP_LINE_RE.search(text) is None:
+                return []
 
-            # Check for @send.agent_name
-            match = self.command_patterns[1].search(line)
-            if match:
-                target_agent = match.group(1)
-                message = match.group(2).strip()
-                commands.append(('send_agent', {'target': target_agent, 'message': message}))
-                continue
-
-            # Check for @all
-            match = self.command_patterns[2].search(line)
-            if match:
-                message = match.group(1).strip()
-                commands.append(('send_all', {'message': message}))
-                continue
+        commands = []
+        line_end = -1
 
-            # Check for @mode.set (orchestrator command)
-            match = self.mode_set_pattern.search(line)
-            if match:
-                mode = match.group(1)
-                topic = match.group(2)
-                rounds = int(match.group(3)) if match.group(3) else 3
-                commands.append(('mode_set', {'mode': mode, 'topic': topic, 'rounds': rounds}))
+        for match in _COMMAND_RE.finditer(text):
+            # One command per line: the leftmost one
+            if match.start() < line_end:
                 continue
-
-            # Check for @mode.status (orchestrator command)
-            match = self.mode_status_pattern.search(line)
-            if match:
+            line_end = text.find(b'\n', match.start())
+            if line_end < 0:
+                line_end = len(text)
+
+            kind = match.lastgroup
+            # Only the captured fields are decoded, never the whole chunk
+            fields = {k: v.decode('utf-8', 'ignore') for k, v in match.groupdict().items() if v is not None}
+            if kind == 'query_log':
+                limit = int(fields['limit']) if 'limit' in fields else 50
+                commands.append(('query_log', {'limit': limit, 'from': fields.get('from'), 'to': fields.get('to')}))
+            elif kind == 'send_agent':
+                commands.append(('send_agent', {'target': fields['target'], 'message': fields['message'].strip()}))
+            elif kind == 'send_all':
+                commands.append(('send_all', {'message': fields['all_message'].strip()}))
+            elif kind == 'mode_set':
+                rounds = int(fields['rounds']) if 'rounds' in fields else 3
+                commands.append(('mode_set', {'mode': fields['mode'], 'topic': fields['topic'], 'rounds': rounds}))
+            elif kind == 'mode_status':
                 commands.append(('mode_status', {}))
-                continue
-
-            # S3: Check for NOOP (orchestrator heartbeat response)
-            match = self.noop_pattern.search(line)
-            if match:
+            elif kind == 'noop':
                 commands.append(('noop', {}))
-                continue
-
-            # Turn timeout extension
-            match = self.working_at_pattern.search(line)
-            if not match:
-                match = self.working_bare_pattern.search(line)
-            if match:
-                note = match.group(1).strip()
-                commands.append(('working', {'note': note}))
-                continue
+            elif kind == 'working':
+                commands.append(('working', {'note': fields['note'].strip()}))
 
         return commands
 
     def execute_command(self, command_type: str, args: dict) -> str:
         """Execute a detected command and return formatted result"""
+        if command_type not in _CACHED_COMMANDS:
+            # Sends and mode changes can alter what the queries return
+            self._result_cache.clear()
+            return self._run_command(command_type, args)
+
+        # Repeated read-only queries within COMMAND_CACHE_TTL share one round-trip
+        key = (command_type, tuple(sorted(args.items())))
+        now = time.monotonic()
+        cached = self._result_cache.get(key)
+        if cached and now - cached[0] < COMMAND_CACHE_TTL:
+            return cached[1]
+        result = self._run_command(command_type, args)
+        if len(self._result_cache) >= 32:
+            self._result_cache.clear()  # Only recent entries are ever hit
+        self._result_cache[key] = (now, result)
+        return result
+
+    def _run_command(self, command_type: str, args: dict) -> str:
         try:
             if command_type == 'query_log':
                 return self._execute_query_log(args)
@@ -161,30 +237,28 @@ class AgentCommandProcessor:
             if args.get('to'):
                 params['to'] = args['to']
 
-            headers = {'X-Auth-Token': self.auth_token} if self.auth_token else {}
-            response = requests.get(
+            response = self._http.get(
                 f"{self.gateway_url}/history",
                 params=params,
-                headers=headers,
                 timeout=2
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 messages = data.get('messages', [])
 
                 if not messages:
                     return "[CSP: No messages in history]"
 
-                result = "[CSP: Recent messages]\n"
+                lines = ["[CSP: Recent messages]"]
                 for msg in messages:
-                    time_str = datetime.fromisoformat(msg['timestamp']).strftime('%H:%M:%S')
+                    time_str = _clock_time(msg['timestamp'])
                     sender = msg.get('from', 'unknown')
                     recipient = msg.get('to', 'broadcast')
                     content = msg.get('content', '')[:100]  # Truncate long messages
-                    result += f"[{time_str}] {sender}: {content}\n"
+                    lines.append(f"[{time_str}] {sender}: {content}")
 
-                return result.rstrip()
+                return "\n".join(lines).rstrip()
             else:
                 return f"[CSP: History query failed ({response.status_code})]"
         except requests.exceptions.Timeout:
@@ -198,17 +272,16 @@ class AgentCommandProcessor:
             target = args.get('target')
             message = args.get('message', '')
 
-            headers = {'X-Auth-Token': self.auth_token} if self.auth_token else {}
             payload = {
                 'from': self.agent_id,
                 'to': target,
                 'content': message
             }
 
-            response = requests.post(
+            response = self._http.post(
                 f"{self.gateway_url}/message",
-                json=payload,
-                headers=headers,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=2
             )
 
@@ -224,17 +297,16 @@ class AgentCommandProcessor:
         try:
             message = args.get('message', '')
 
-            headers = {'X-Auth-Token': self.auth_token} if self.auth_token else {}
             payload = {
                 'from': self.agent_id,
                 'to': 'broadcast',
                 'content': message
             }
 
-            response = requests.post(
+            response = self._http.post(
                 f"{self.gateway_url}/message",
-                json=payload,
-                headers=headers,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=2
             )
 
@@ -252,18 +324,16 @@ class AgentCommandProcessor:
             topic = args.get('topic', '')
             rounds = args.get('rounds', 3)
 
-            headers = {'X-Auth-Token': self.auth_token} if self.auth_token else {}
 
             # Get list of connected agents (excluding Human)
-            agents_response = requests.get(
+            agents_response = self._http.get(
                 f"{self.gateway_url}/agents",
-                headers=headers,
                 timeout=2
             )
 
             agent_ids = []
             if agents_response.status_code == 200:
-                agents = agents_response.json()
+                agents = _loads(agents_response.content)
                 agent_ids = [a['id'] for a in agents if a['id'] != 'Human' and a['id'] != self.agent_id]
 
             # Set the mode
@@ -274,17 +344,17 @@ class AgentCommandProcessor:
                 'agents': agent_ids
             }
 
-            response = requests.post(
+            response = self._http.post(
                 f"{self.gateway_url}/mode",
-                json=payload,
-                headers=headers,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=2
             )
 
             if response.status_code in [200, 201]:
                 return f"[CSP: Mode set to {mode.upper()} - Topic: {topic}]"
             else:
-                error = response.json().get('error', 'Unknown error')
+                error = _loads(response.content).get('error', 'Unknown error')
                 return f"[CSP: Mode set failed - {error}]"
         except Exception as e:
             return f"[CSP: Mode set error - {str(e)}]"
@@ -292,16 +362,14 @@ class AgentCommandProcessor:
     def _execute_mode_status(self, args: dict) -> str:
         """Get current orchestration mode status (orchestrator command)"""
         try:
-            headers = {'X-Auth-Token': self.auth_token} if self.auth_token else {}
 
-            response = requests.get(
+            response = self._http.get(
                 f"{self.gateway_url}/mode",
-                headers=headers,
                 timeout=2
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 mode = data.get('mode', 'freeform')
                 topic = data.get('topic', 'N/A')
                 round_num = data.get('round', 0) + 1
@@ -325,17 +393,16 @@ class AgentCommandProcessor:
             note = (args.get('note') or '').strip()
             content = "WORKING" if not note else f"WORKING {note}"
 
-            headers = {'X-Auth-Token': self.auth_token} if self.auth_token else {}
             payload = {
                 "from": self.agent_id,
                 "to": "broadcast",
                 "content": content
             }
 
-            response = requests.post(
+            response = self._http.post(
                 f"{self.gateway_url}/message",
-                json=payload,
-                headers=headers,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=2
             )
 
@@ -346,31 +413,55 @@ class AgentCommandProcessor:
             return f"[CSP: Working signal error - {str(e)}]"
 
 
+# Terminal escape sequences: CSI (ESC [ params final), OSC (ESC ] ... BEL or
+# ST) and short ESC sequences (intermediates + final byte)
+_ANSI_RE = re.compile(
+    rb'\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[ -/]*[0-Z\\^-~])'
+)
+# A sequence cut off by the end of a chunk, and the longest one carried over
+_ANSI_PARTIAL_RE = re.compile(rb'\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*\x1b?|[ -/]*)\Z')
+_ANSI_CARRY_MAX = 256
+
+
 class StreamCleaner:
     """Stateful ANSI stripper that tolerates chunked sequences."""
     def __init__(self):
-        self.in_ansi = False
-        self.ansi_buf = []
-
-    def process(self, data: bytes) -> str:
-        out = []
-        for b in data:
-            if not self.in_ansi:
-                if b == 0x1B:  # ESC
-                    self.in_ansi = True
-                    self.ansi_buf = [b]
-                    continue
-                out.append(b)
-            else:
-                self.ansi_buf.append(b)
-                # Final bytes for ANSI sequences are in 0x40..0x7E
-                if 0x40 <= b <= 0x7E:
-                    self.in_ansi = False
-                    self.ansi_buf = []
-        try:
-            return bytes(out).decode('utf-8', errors='ignore')
-        except Exception:
-            return ""
+        self.carry = b""
+
+    def process(self, data: bytes) -> bytes:
+        buf = _ANSI_RE.sub(b'', self.carry + data)
+        # Hold back a sequence split across reads until its final byte
+        # arrives. Only the last ESC (or the one before it, for an OSC cut
+        # after its terminating ESC) can start one, so check just those.
+        lo = max(len(buf) - _ANSI_CARRY_MAX, 0)
+        cut = buf.rfind(b'\x1b', lo)
+        if cut >= 0:
+            prev = buf.rfind(b'\x1b', lo, cut)
+            if prev >= 0 and _ANSI_PARTIAL_RE.match(buf, prev):
+                cut = prev
+            elif not _ANSI_PARTIAL_RE.match(buf, cut):
+                cut = -1
+        if cut >= 0:
+            self.carry = buf[cut:]
+            buf = buf[:cut]
+        else:
+            self.carry = b""
+        return buf.replace(b'\x1b', b'')
+
+
+# Prompt patterns (>, $, #, ?, :, [y/n] or "Press ... to continue" at the end
+# of output), matched in one pass over the raw tail bytes
+_PROMPT_RE = re.compile(rb'(?:[>$#?:]|\[y/n\])\s*$|Press.*to continue.*$')
+_PROMPT_ENDINGS = (b'>', b'$', b'#', b'?', b':', b'[y/n]')
+
+
+def _is_prompt(tail: bytes) -> bool:
+    """True if the output tail ends in a prompt (see _PROMPT_RE)."""
+    # The common prompts are plain suffixes; only "Press ... to continue"
+    # needs the regex, and only when the word is in the tail at all
+    if tail.rstrip().endswith(_PROMPT_ENDINGS):
+        return True
+    return b'Press' in tail and _PROMPT_RE.search(tail) is not None
 
 
 class FlowController:
@@ -382,27 +473,56 @@ class FlowController:
         self.max_queue = max_queue
         self.urgent_queue = collections.deque()
         self.normal_queue = collections.deque()
-        self.last_output_ts = time.time()
-        self.recent_buffer = b""
-        # Regex prompt patterns
-        self.prompt_patterns = [
-            re.compile(r'.*[>$#]\s*$'),
-            re.compile(r'.*\?\s*$'),
-            re.compile(r'.*:\s*$'),
-            re.compile(r'.*\[y/n\]\s*$'),
-            re.compile(r'Press.*to continue.*$')
-        ]
-
-    def on_output(self, data: bytes):
+        # Interval bookkeeping uses time.monotonic(), immune to clock steps
+        self.last_output_ts = time.monotonic()
+        self._last_stale_scan = float('-inf')
+        self._last_status_write = float('-inf')
+        # Ring buffer holding the last FLOW_TAIL_SIZE bytes of output
+        self.recent_buffer = bytearray(FLOW_TAIL_SIZE)
+        self._rb_pos = 0
+        self._rb_filled = 0
+        # Last read if it alone covers the whole tail; copied in only when needed
+        self._rb_pending = None
+        # Prompt match for the current tail, None until checked after output
+        self._prompt_seen = None
+
+    def on_output(self, data: bytes, now: Optional[float] = None):
         """Called whenever output arrives from the agent."""
-        self.last_output_ts = time.time()
-        self.recent_buffer += data
-        if len(self.recent_buffer) > 200:
-            self.recent_buffer = self.recent_buffer[-200:]
-
-    def is_idle(self) -> bool:
+        self.last_output_ts = time.monotonic() if now is None else now
+        self._prompt_seen = None
+        if len(data) >= FLOW_TAIL_SIZE:
+            # A bulk read replaces the whole tail: keep a reference instead of
+            # copying, since the tail is rarely looked at during bursts
+            self._rb_pending = data
+            return
+        if self._rb_pending is not None:
+            pending, self._rb_pending = self._rb_pending, None
+            self._ring_write(pending)
+        self._ring_write(data)
+
+    def _ring_write(self, data: bytes):
+        size = FLOW_TAIL_SIZE
+        view = memoryview(data)[-size:]
+        n = len(view)
+        pos = self._rb_pos
+        first = min(n, size - pos)
+        self.recent_buffer[pos:pos + first] = view[:first]
+        self.recent_buffer[:n - first] = view[first:]
+        self._rb_pos = (pos + n) % size
+        self._rb_filled = min(self._rb_filled + n, size)
+
+    def _tail_bytes(self) -> bytes:
+        """Return the buffered output tail in order (oldest byte first)."""
+        if self._rb_pending is not None:
+            return self._rb_pending[-FLOW_TAIL_SIZE:]
+        if self._rb_filled < FLOW_TAIL_SIZE:
+            return bytes(self.recent_buffer[:self._rb_filled])
+        pos = self._rb_pos
+        return bytes(self.recent_buffer[pos:] + self.recent_buffer[:pos])
+
+    def is_idle(self, now: Optional[float] = None) -> bool:
         """Time + tail heuristic to decide if it is safe to inject."""
-        silence = time.time() - self.last_output_ts
+        silence = (time.monotonic() if now is None else now) - self.last_output_ts
 
         # Fast path: too recent => not idle
         if silence < self.min_silence:
@@ -412,16 +532,14 @@ class FlowController:
         if silence > self.long_silence:
             return True
 
-        # Prompt/tail detection
-        tail_str = self.recent_buffer.decode('utf-8', errors='ignore')
-        for pattern in self.prompt_patterns:
-            if pattern.search(tail_str):
-                return True
-
-        return False
+        # Prompt/tail detection; the tail only changes with new output, so
+        # repeated checks while waiting out the silence reuse the result
+        if self._prompt_seen is None:
+            self._prompt_seen = _is_prompt(self._tail_bytes())
+        return self._prompt_seen
 
     def enqueue(self, sender: str, content: str, priority: str = "normal"):
-        msg = {"sender": sender, "content": content, "timestamp": time.time()}
+        msg = {"sender": sender, "content": content, "timestamp": time.monotonic()}
 
         if priority == "urgent":
             queue = self.urgent_queue
@@ -435,17 +553,30 @@ class FlowController:
 
         queue.append(msg)
 
-        # Ghost log for the human (stderr only)
-        sys.stderr.write(f"\r\033[90m[CSP: {len(self.urgent_queue)+len(self.normal_queue)} queued, waiting]\033[0m")
-        sys.stderr.flush()
+        # Ghost log for the human (stderr only), at most every
+        # FLOW_STATUS_INTERVAL so bursts of replies don't write per message
+        if msg["timestamp"] - self._last_status_write >= FLOW_STATUS_INTERVAL:
+            self._last_status_write = msg["timestamp"]
+            sys.stderr.write(f"\r\033[90m[CSP: {len(self.urgent_queue)+len(self.normal_queue)} queued, waiting]\033[0m")
+            sys.stderr.flush()
+
+    def has_queued(self) -> bool:
+        return bool(self.urgent_queue or self.normal_queue)
 
     def pop_ready(self):
-        # Drop stale (>5 minutes)
-        cutoff = time.time() - 300
-        for queue in (self.urgent_queue, self.normal_queue):
-            while queue and queue[0].get("timestamp", 0) < cutoff:
-                dropped = queue.popleft()
-                sys.stderr.write(f"\r\033[93m[CSP: Dropped stale message from {dropped['sender']}]\033[0m\n")
+        # Drop stale (>5 minutes). Queues are FIFO in timestamp order, so
+        # only their heads can be stale, and a check every 30s is enough.
+        now = time.monotonic()
+        if now - self._last_stale_scan >= 30:
+            self._last_stale_scan = now
+            cutoff = now - 300
+            dropped = 0
+            for queue in (self.urgent_queue, self.normal_queue):
+                while queue and queue[0].get("timestamp", 0) < cutoff:
+                    queue.popleft()
+                    dropped += 1
+            if dropped:
+                sys.stderr.write(f"\r\033[93m[CSP: Dropped {dropped} stale message(s)]\033[0m\n")
 
         for queue in (self.urgent_queue, self.normal_queue):
             if queue:
@@ -454,6 +585,19 @@ class FlowController:
                 return queue.popleft()
         return None
 
+
+# _sanitize_stream passes, compiled once (see the numbered steps there)
+_CSI_OSC_RE = re.compile(r'\x1b(?:\[[0-9;]*[A-Za-z]|\][^\x07\x1b]*(?:\x07|\x1b\\)?)')
+_ORPHAN_CSI_RE = re.compile(r'(?<![a-zA-Z\x1b])\d*;\d*[A-HJKSTfmsu](?![a-zA-Z])')
+_DEC_MODE_RE = re.compile(r'\?\d+[hl]')
+_CONTROL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+# Same characters as a deletion table; str.translate beats the regex on
+# ASCII text but falls back to a slow per-character path otherwise
+_CONTROL_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f])
+_BLANKS_RE = re.compile(r'[ \t]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
 class CSPSidecar:
     def __init__(self, cmd, agent_name, gateway_url=GATEWAY_URL, initial_prompt=None, auth_token=None):
         self.cmd = cmd
@@ -461,20 +605,42 @@ class CSPSidecar:
         self.gateway_url = gateway_url
         self.initial_prompt = initial_prompt
         self.auth_token = auth_token
+        # One keep-alive HTTP session for all gateway calls
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
+        if auth_token:
+            self._http.headers["X-Auth-Token"] = auth_token
+        # Agent output is posted on every flush; the stream sender talks to
+        # urllib3 directly to skip the requests layers on that hot path
+        self._stream_pool = urllib3.PoolManager(num_pools=1, maxsize=1, retries=False)
+        self._stream_headers = dict(_JSON_HEADERS)
+        if auth_token:
+            self._stream_headers["X-Auth-Token"] = auth_token
         self.master_fd = None
+        self.child_pid = None
+        self.child_status = None
+        self._sel = selectors.DefaultSelector()
+        self._wakeup_r = self._wakeup_w = None
         self.should_exit = False
         self.agent_id = None
         self.cleaner = StreamCleaner()
-        self.stream_buffer = ""
-        self.last_flush_time = time.time()
+        # Clean output bytes waiting for the next flush, joined and decoded
+        # only at flush time (the decoder keeps characters split by a flush)
+        self.stream_buffer = []
+        self._stream_len = 0
+        self._stream_decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self._out_queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self.last_flush_time = time.monotonic()
         self.paused = False
-        self.pending_msgs = []
+        self.pending_msgs = collections.deque()
         # WebSocket connection management
         self.ws = None
         self.ws_connected = False
         self.ws_reconnect_attempts = 0
-        self.max_reconnect_attempts = 5
-        self.reconnect_delay = 1  # Start with 1 second
+        self.max_reconnect_attempts = 5  # Failures before the gateway counts as offline
+        self.reconnect_delay = WS_RECONNECT_BASE_DELAY
         # Agent-specific flow tuning
         lower_name = self.agent_name.lower()
         if 'claude' in lower_name:
@@ -501,21 +667,19 @@ class CSPSidecar:
         # Normalize agent name: lowercase, spaces to dashes, keep full name (no truncation)
         requested_id = self.agent_name.lower().replace(' ', '-')
 
-        headers = {"X-Auth-Token": self.auth_token}
-
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.gateway_url}/register",
-                json={
+                data=_dumps({
                     "agentId": requested_id,
                     "capabilities": {"chat": True, "respond": True}
-                },
-                headers=headers,
+                }),
+                headers=_JSON_HEADERS,
                 timeout=5
             )
 
             if response.status_code in [200, 201]:
-                data = response.json()
+                data = _loads(response.content)
                 # Use gateway-assigned ID (may differ if duplicates exist, e.g., claude-2)
                 self.agent_id = data.get('agentId', requested_id)
                 print(f"Successfully registered as agent {self.agent_id}", file=sys.stderr)
@@ -553,6 +717,7 @@ class CSPSidecar:
             os.execvp(self.cmd[0], self.cmd)
         else:
             # PARENT PROCESS (The Sidecar)
+            self.child_pid = pid
             self.setup_signal_handlers()
 
             # Inject system prompt if configured
@@ -565,6 +730,9 @@ class CSPSidecar:
             if self.agent_id:
                 self._listener_thread = threading.Thread(target=self.gateway_listener, daemon=True)
                 self._listener_thread.start()
+                # Gateway output POSTs run off the PTY read path
+                self._sender_thread = threading.Thread(target=self.stream_sender, daemon=True)
+                self._sender_thread.start()
 
             try:
                 if old_tty:
@@ -579,8 +747,14 @@ class CSPSidecar:
                 # Cleanup sequence
                 self.should_exit = True
 
-                # Final stream flush
+                # Final stream flush, then let the sender drain its queue
                 self.maybe_flush_stream(force=True)
+                if hasattr(self, '_sender_thread'):
+                    try:
+                        self._out_queue.put_nowait(None)
+                    except queue.Full:
+                        pass  # Sender is stuck on the gateway; it stops on should_exit
+                    self._sender_thread.join(timeout=2)
 
                 # Wait for listener thread to exit
                 if hasattr(self, '_listener_thread') and self._listener_thread.is_alive():
@@ -588,6 +762,14 @@ class CSPSidecar:
                     if self._listener_thread.is_alive():
                         print("Warning: Listener thread did not exit cleanly", file=sys.stderr)
 
+                # Drop selector registrations before closing the fds
+                self._sel.close()
+                if self._wakeup_w is not None:
+                    signal.set_wakeup_fd(-1)
+                    os.close(self._wakeup_r)
+                    os.close(self._wakeup_w)
+                    self._wakeup_r = self._wakeup_w = None
+
                 # Close PTY master
                 if self.master_fd is not None:
                     try:
@@ -625,68 +807,104 @@ class CSPSidecar:
         signal.signal(signal.SIGWINCH, lambda s, f: self.set_winsize())
         self.set_winsize()
 
+        # Signals write to this pipe, so a SIGCHLD wakes the selector at once
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        signal.set_wakeup_fd(self._wakeup_w, warn_on_full_buffer=False)
+        self._sel.register(self._wakeup_r, selectors.EVENT_READ, 'wakeup')
+        signal.signal(signal.SIGCHLD, self._on_sigchld)
+        self._on_sigchld(signal.SIGCHLD, None)  # In case it already exited
+
+    def _on_sigchld(self, signum, frame):
+        """Reap the agent when it exits (tmux helpers also raise SIGCHLD)."""
+        try:
+            pid, status = os.waitpid(self.child_pid, os.WNOHANG)
+        except ChildProcessError:
+            pid, status = self.child_pid, None  # Already reaped
+        if pid != 0:
+            self.child_status = status
+            self.should_exit = True
+
     def loop(self, child_pid):
         stdin_fd = sys.stdin.fileno() if sys.stdin.isatty() else -1
 
-        while not self.should_exit:
-            # Check if child process is still alive
-            try:
-                pid, status = os.waitpid(child_pid, os.WNOHANG)
-                if pid != 0:  # Child exited
-                    print(f"\nChild process exited with status {status}", file=sys.stderr)
-                    self.should_exit = True
-                    break
-            except OSError:
-                # Child already reaped or other error
-                self.should_exit = True
-                break
-
-            # Set up file descriptors for select
-            read_fds = [self.master_fd]
-            if stdin_fd >= 0:
-                read_fds.append(stdin_fd)
+        # Register both fds once; the selector is reused for every wait
+        self._sel.register(self.master_fd, selectors.EVENT_READ, 'master')
+        if stdin_fd >= 0:
+            self._sel.register(stdin_fd, selectors.EVENT_READ, 'stdin')
+
+        # Bind what every iteration touches to locals. The fds, flow
+        # controller, cleaner and command processor are fixed for the loop.
+        read = os.read
+        monotonic = time.monotonic
+        select = self._sel.select
+        master_fd = self.master_fd
+        stdout_fd = sys.stdout.fileno()
+        flow = self.flow
+        clean = self.cleaner.process
+        detect = self.command_processor.detect_commands if self.command_processor else None
 
+        while not self.should_exit:
             try:
-                r, _, _ = select.select(read_fds, [], [], 0.1)  # 100ms timeout
+                # Tick every 100ms only while injections wait for the agent to
+                # go idle; otherwise output, input and signals wake us
+                timeout = 0.1 if flow.has_queued() and not self.paused else SELECT_IDLE_TIMEOUT
+                r = {key.data for key, _ in select(timeout)}
             except OSError:
                 break # Interrupted system call
+            now = monotonic()  # One clock read per wakeup
+
+            if 'wakeup' in r:
+                # Drain the signal wakeup bytes; handlers already ran
+                try:
+                    read(self._wakeup_r, 512)
+                except BlockingIOError:
+                    pass
 
-            if self.master_fd is not None and self.master_fd in r:
+            if 'master' in r:
                 # Data from Agent -> User
                 try:
-                    data = os.read(self.master_fd, 1024)
+                    data = read(master_fd, PTY_READ_SIZE)
                 except OSError:
                     break
 
                 if not data:
                     break
 
+                # The PTY hands out bursts ~4 KiB per read; gather what is
+                # already buffered so it is forwarded and scanned once
+                if len(data) < PTY_READ_SIZE:
+                    data = self._gather_master(data)
+
                 # 1. Forward to real stdout
-                os.write(sys.stdout.fileno(), data)
+                _write_all(stdout_fd, data)
                 # 1b. Update flow controller with fresh output
-                self.flow.on_output(data)
+                flow.on_output(data, now)
 
                 # 2. Adaptive chunking for Gateway + Phase 2: Command detection
-                clean_chunk = self.cleaner.process(data)
+                clean_chunk = clean(data)
                 if clean_chunk:
                     # Phase 2: Check for @-commands in agent output
-                    if self.command_processor:
-                        commands = self.command_processor.detect_commands(clean_chunk)
-                        for cmd_type, cmd_args in commands:
+                    if detect:
+                        for cmd_type, cmd_args in detect(clean_chunk):
                             # Execute the command
                             result = self.command_processor.execute_command(cmd_type, cmd_args)
                             # Inject result back to agent with slight delay to avoid buffer issues
-                            self.flow.enqueue('CSP', result, priority='normal')
+                            flow.enqueue('CSP', result, priority='normal')
                             print(f"[CSP] Detected {cmd_type} command, enqueued response", file=sys.stderr)
 
-                    self.stream_buffer += clean_chunk
-                    boundary = ('\n' in clean_chunk) or ('. ' in clean_chunk)
-                    self.maybe_flush_stream(boundary=boundary)
+                    # Output is only buffered for the gateway while sharing
+                    if self.share_enabled:
+                        self.stream_buffer.append(clean_chunk)
+                        self._stream_len += len(clean_chunk)
+                        boundary = (b'\n' in clean_chunk) or (b'. ' in clean_chunk)
+                        self.maybe_flush_stream(boundary=boundary, now=now)
 
-            if stdin_fd in r:
+            if 'stdin' in r:
                 # Data from User -> Agent
                 try:
-                    data = os.read(stdin_fd, 1024)
+                    data = read(stdin_fd, PTY_READ_SIZE)
                 except OSError:
                     break
 
@@ -694,62 +912,144 @@ class CSPSidecar:
                     break
 
                 # 1. Forward to Agent
-                if self.master_fd is not None:
-                    os.write(self.master_fd, data)
+                _write_all(master_fd, data)
 
                 # 2. Optional: Log to Gateway (so others see what Human typed)
                 # self.send_to_gateway({"type": "human_input", "content": data.decode('utf-8', errors='ignore')})
 
             # Opportunistically deliver queued messages when idle and not paused
-            if not self.paused and self.flow.is_idle():
-                ready = self.flow.pop_ready()
+            if not self.paused and flow.is_idle(now):
+                ready = flow.pop_ready()
                 if ready:
                     self._write_injection(ready['sender'], ready['content'])
 
-    def maybe_flush_stream(self, boundary: bool = False, force: bool = False):
+        if self.child_status is not None:
+            # The agent may exit before its last output was read
+            self._drain_master()
+            print(f"\nChild process exited with status {self.child_status}", file=sys.stderr)
+
+    def _master_ready(self) -> bool:
+        """True if the PTY master can be read without blocking."""
+        return any(key.data == 'master' for key, _ in self._sel.select(0))
+
+    def _gather_master(self, data: bytes) -> bytes:
+        """Append PTY output that is already buffered, up to PTY_READ_SIZE."""
+        parts = [data]
+        size = len(data)
+        try:
+            while size < PTY_READ_SIZE and self._master_ready():
+                more = os.read(self.master_fd, PTY_READ_SIZE - size)
+                if not more:
+                    break
+                parts.append(more)
+                size += len(more)
+        except OSError:
+            pass  # The next read in the main loop sees the error
+        return data if len(parts) == 1 else b''.join(parts)
+
+    def _drain_master(self):
+        """Forward output still buffered in the PTY without blocking."""
+        try:
+            while self._master_ready():
+                data = os.read(self.master_fd, PTY_READ_SIZE)
+                if not data:
+                    break
+                _write_all(sys.stdout.fileno(), data)
+        except OSError:
+            pass  # EIO once the slave side is closed and empty
+
+    def maybe_flush_stream(self, boundary: bool = False, force: bool = False, now: Optional[float] = None):
         """Decide when to flush based on time, size, or detected boundaries."""
-        now = time.time()
+        if now is None:
+            now = time.monotonic()
 
         if force:
-            self.flush_stream()
+            self.flush_stream(now)
             return
 
-        if len(self.stream_buffer) >= STREAM_MAX_BUFFER:
-            self.flush_stream()
+        if self._stream_len >= STREAM_MAX_BUFFER:
+            self.flush_stream(now)
             return
 
-        if boundary or len(self.stream_buffer) >= STREAM_CHUNK_THRESHOLD or (now - self.last_flush_time) >= STREAM_FLUSH_INTERVAL:
-            self.flush_stream()
+        if boundary or self._stream_len >= STREAM_CHUNK_THRESHOLD or (now - self.last_flush_time) >= STREAM_FLUSH_INTERVAL:
+            self.flush_stream(now)
+
+    def flush_stream(self, now: Optional[float] = None):
+        """Hand buffered clean text to the sender thread without blocking."""
+        if now is None:
+            now = time.monotonic()
 
-    def flush_stream(self):
-        """Send buffered clean text to the gateway with auth."""
         # Only share if explicitly enabled by an inbound message
         if not self.share_enabled:
-            self.stream_buffer = ""
-            self.last_flush_time = time.time()
+            self.stream_buffer.clear()
+            self._stream_len = 0
+            self._stream_decoder.reset()
+            self.last_flush_time = now
             return
 
         if not self.stream_buffer or not self.agent_id:
-            self.last_flush_time = time.time()
+            self.last_flush_time = now
             return
 
-        cleaned = self._sanitize_stream(self.stream_buffer)
+        text = self._stream_decoder.decode(b"".join(self.stream_buffer))
+        self.stream_buffer.clear()
+        self._stream_len = 0
+        self.last_flush_time = now
+        try:
+            self._out_queue.put_nowait(text)
+        except queue.Full:
+            # Gateway is falling behind: drop the oldest chunk, keep the newest
+            try:
+                self._out_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._out_queue.put_nowait(text)
+
+    def stream_sender(self):
+        """Post flushed output chunks to the gateway until a None sentinel
+        (or, if shutdown could not queue one, until should_exit on an idle queue).
+
+        Chunks that queue up while a POST is in flight (or arrive within
+        STREAM_BATCH_WAIT of the first) are joined, in order, into one POST.
+        """
+        while True:
+            try:
+                text = self._out_queue.get(timeout=0.5)
+            except queue.Empty:
+                if self.should_exit:
+                    break  # Shutdown found the queue full and dropped the sentinel
+                continue
+            if text is None:
+                break
+            batch = [text]
+            done = False
+            try:
+                item = self._out_queue.get(timeout=STREAM_BATCH_WAIT)
+                while True:
+                    if item is None:
+                        done = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= STREAM_BATCH_MAX:
+                        break
+                    item = self._out_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._post_stream(''.join(batch))
+            if done:
+                break
+
+    def _post_stream(self, text: str):
+        """Send one chunk of clean text to the gateway with auth."""
+        cleaned = self._sanitize_stream(text)
         if not cleaned or len(cleaned.strip()) < 10:
-            self.stream_buffer = ""
-            self.last_flush_time = time.time()
             return
 
         # Require a minimum signal-to-noise ratio (printables)
         printable_chars = sum(ch.isalnum() for ch in cleaned)
         if printable_chars == 0 or (printable_chars / max(len(cleaned), 1)) < 0.3:
-            self.stream_buffer = ""
-            self.last_flush_time = time.time()
             return
 
-        headers = {}
-        if self.auth_token:
-            headers["X-Auth-Token"] = self.auth_token
-
         payload = {
             "from": self.agent_id,
             "to": "broadcast",
@@ -757,53 +1057,54 @@ class CSPSidecar:
         }
 
         try:
-            response = requests.post(
+            response = self._stream_pool.request(
+                'POST',
                 f"{self.gateway_url}/agent-output",
-                json=payload,
-                headers=headers,
-                timeout=0.2
+                body=_dumps(payload),
+                headers=self._stream_headers,
+                timeout=2.0
             )
-            if response.status_code not in [200, 201]:
-                print(f"Gateway output failed: {response.status_code}", file=sys.stderr)
-        except requests.exceptions.RequestException as e:
+            if response.status not in [200, 201]:
+                print(f"Gateway output failed: {response.status}", file=sys.stderr)
+        except urllib3.exceptions.HTTPError as e:
             print(f"Gateway communication error: {e}", file=sys.stderr)
         except Exception as e:
-            print(f"Unexpected error in flush_stream: {e}", file=sys.stderr)
-        finally:
-            self.stream_buffer = ""
-            self.last_flush_time = time.time()
-            # Keep sharing enabled for continuous communication
+            print(f"Unexpected error in stream sender: {e}", file=sys.stderr)
 
     def _sanitize_stream(self, text: str) -> str:
         """
         Remove ANSI escape sequences and control characters from terminal output.
         Handles complete CSI sequences and orphaned fragments from TUI apps.
         """
-        # 1. Strip complete ANSI CSI sequences: ESC [ <params> <final>
-        text = re.sub(r'\x1b\[[0-9;]*[A-Za-z]', '', text)
-
-        # 2. Strip complete OSC sequences: ESC ] ... (BEL or ESC \)
-        text = re.sub(r'\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)?', '', text)
+        # 1+2. Strip complete ANSI CSI (ESC [ <params> <final>) and OSC
+        # (ESC ] ... BEL or ESC \) sequences in one pass. They need an ESC,
+        # which is rare here since StreamCleaner already removed escape
+        # sequences; a substring check is far cheaper than the regex pass
+        if '\x1b' in text:
+            text = _CSI_OSC_RE.sub('', text)
 
         # 3. Strip orphaned CSI parameters (no ESC prefix, leaked after ESC stripping)
         # These are cursor/erase commands: A-H, J, K, S, T, f, m, s, u
         # CONSERVATIVE: Only strip patterns with semicolons (definitely CSI params)
         # This avoids false positives like "3m" (3 meters) or "10K" (10 thousand)
         # Examples matched: "31;2H", "1;31m", ";0m" (but NOT "3m", "31m", "2J" alone)
-        text = re.sub(r'(?<![a-zA-Z\x1b])\d*;\d*[A-HJKSTfmsu](?![a-zA-Z])', '', text)
+        if ';' in text:
+            text = _ORPHAN_CSI_RE.sub('', text)
 
         # 4. Strip DEC private modes: ?NNNNh or ?NNNNl
-        text = re.sub(r'\?\d+[hl]', '', text)
-
-        # 5. Strip remaining standalone escape character
-        text = re.sub(r'\x1b', '', text)
+        if '?' in text:
+            text = _DEC_MODE_RE.sub('', text)
 
-        # 6. Strip other control characters (except newline, tab)
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)
+        # 5+6. Strip control characters except newline and tab; the class
+        # includes ESC, so this also removes any remaining standalone ESC
+        if text.isascii():
+            text = text.translate(_CONTROL_TABLE)
+        else:
+            text = _CONTROL_RE.sub('', text)
 
         # 7. Collapse excessive whitespace
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _BLANKS_RE.sub(' ', text)
+        text = _BLANK_LINES_RE.sub('\n\n', text)
 
         return text.strip()
 
@@ -845,7 +1146,8 @@ class CSPSidecar:
                 on_close=self.on_ws_close
             )
 
-            print(f"[CSP] Attempting WebSocket connection to {ws_url}", file=sys.stderr)
+            if self.ws_reconnect_attempts < self.max_reconnect_attempts:
+                print(f"[CSP] Attempting WebSocket connection to {ws_url}", file=sys.stderr)
             return True
 
         except Exception as e:
@@ -856,7 +1158,14 @@ class CSPSidecar:
         """Run WebSocket event loop"""
         try:
             if self.ws is not None:
-                self.ws.run_forever()
+                # Ping so silently dropped connections are noticed within
+                # WS_PING_INTERVAL + WS_PING_TIMEOUT; no Nagle delay on small frames
+                self.ws.run_forever(
+                    ping_interval=WS_PING_INTERVAL,
+                    ping_timeout=WS_PING_TIMEOUT,
+                    skip_utf8_validation=True,
+                    sockopt=((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),)
+                )
         except Exception as e:
             print(f"[CSP] WebSocket error: {e}", file=sys.stderr)
             self.ws_connected = False
@@ -865,13 +1174,13 @@ class CSPSidecar:
         """WebSocket connection opened"""
         self.ws_connected = True
         self.ws_reconnect_attempts = 0
-        self.reconnect_delay = 1
+        self.reconnect_delay = WS_RECONNECT_BASE_DELAY
         print(f"[CSP] WebSocket connected for agent {self.agent_id}", file=sys.stderr)
 
     def on_ws_message(self, ws, message):
         """Handle incoming WebSocket message"""
         try:
-            msg_data = json.loads(message)
+            msg_data = _loads(message)
 
             # Filter messages for this agent
             to = msg_data.get('to', '')
@@ -880,56 +1189,67 @@ class CSPSidecar:
                     self.inject_message(msg_data)
 
         except json.JSONDecodeError as e:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
             print(f"[CSP] Invalid WebSocket message: {e}", file=sys.stderr)
         except Exception as e:
             print(f"[CSP] WebSocket message handling error: {e}", file=sys.stderr)
 
     def on_ws_error(self, ws, error):
         """WebSocket error handler"""
-        print(f"[CSP] WebSocket error: {error}", file=sys.stderr)
+        if self.ws_reconnect_attempts < self.max_reconnect_attempts:
+            print(f"[CSP] WebSocket error: {error}", file=sys.stderr)
         self.ws_connected = False
 
     def on_ws_close(self, ws, close_status_code, close_msg):
         """WebSocket connection closed"""
         self.ws_connected = False
         if not self.should_exit:
-            print(f"[CSP] WebSocket disconnected (code: {close_status_code}), will retry", file=sys.stderr)
-            # Implement exponential backoff capped at 10s
+            self.ws_reconnect_attempts += 1
             if self.ws_reconnect_attempts < self.max_reconnect_attempts:
-                self.ws_reconnect_attempts += 1
-                self.reconnect_delay = min(self.reconnect_delay * 2, 10)  # Max 10 seconds
-                time.sleep(self.reconnect_delay)
+                print(f"[CSP] WebSocket disconnected (code: {close_status_code}), will retry", file=sys.stderr)
+            elif self.ws_reconnect_attempts == self.max_reconnect_attempts:
+                # Stop logging every attempt once the gateway looks offline
+                print(f"[CSP] Gateway unreachable after {self.ws_reconnect_attempts} attempts, "
+                      f"retrying every {WS_RECONNECT_MAX_DELAY}s at most", file=sys.stderr)
+            # Exponential backoff with full jitter, so sidecars don't all
+            # reconnect at once when the gateway restarts
+            time.sleep(random.uniform(0, self.reconnect_delay))
+            self.reconnect_delay = min(self.reconnect_delay * 2, WS_RECONNECT_MAX_DELAY)
 
     def http_polling_fallback(self):
         """Fallback to HTTP polling when WebSocket is unavailable"""
         print(f"[CSP] Using HTTP polling fallback for agent {self.agent_id}", file=sys.stderr)
 
+        retry_at = time.monotonic() + WS_RETRY_INTERVAL
         while not self.should_exit and not self.ws_connected:
+            # Periodically leave the fallback to retry the WebSocket
+            if time.monotonic() >= retry_at:
+                break
+
             try:
+                started = time.monotonic()
                 if self.agent_id:
-                    headers = {}
-                    if self.auth_token:
-                        headers["X-Auth-Token"] = self.auth_token
-
-                    resp = requests.get(
+                    # Long-poll: the gateway answers as soon as a message is
+                    # queued, or with [] after INBOX_LONG_POLL_WAIT. Holds are
+                    # kept short so should_exit is seen before run() stops
+                    # waiting for this thread.
+                    resp = self._http.get(
                         f"{self.gateway_url}/inbox/{self.agent_id}",
-                        headers=headers,
-                        timeout=1
+                        params={'wait': INBOX_LONG_POLL_WAIT},
+                        timeout=INBOX_LONG_POLL_WAIT + 1
                     )
                     if resp.status_code == 200:
-                        messages = resp.json()
+                        messages = _loads(resp.content)
                         for msg in messages:
                             if not self.should_exit:
                                 self.inject_message(msg)
                     elif resp.status_code not in [404, 401]:
                         print(f"Gateway inbox poll failed: {resp.status_code}", file=sys.stderr)
 
-                time.sleep(POLL_INTERVAL)
-
-                # Periodically retry WebSocket connection
-                if self.ws_reconnect_attempts < self.max_reconnect_attempts:
-                    time.sleep(5)  # Try WebSocket again every 5 seconds
-                    break  # Exit fallback to retry WebSocket
+                # A gateway without long-poll support answers at once; pace
+                # those polls at POLL_INTERVAL
+                if time.monotonic() - started < INBOX_LONG_POLL_WAIT / 2:
+                    time.sleep(POLL_INTERVAL)
 
             except requests.exceptions.RequestException as e:
                 print(f"Gateway polling error: {e}", file=sys.stderr)
@@ -1015,7 +1335,7 @@ class CSPSidecar:
             print(f"[CSP] Resumed injections for {self.agent_id}", file=sys.stderr)
             # deliver backlog
             while self.pending_msgs:
-                pending = self.pending_msgs.pop(0)
+                pending = self.pending_msgs.popleft()
                 self._write_injection(pending['sender'], pending['content'])
             return
 
@@ -1054,16 +1374,13 @@ class CSPSidecar:
         fall back to PTY master write if not in tmux.
         """
         # Add turn marker if this is a turn signal
-        turn_marker = ""
-        if turn_signal == 'your_turn':
-            turn_marker = "[YOUR TURN] "
-
-        # Format the message
-        message = f"{turn_marker}[From {sender}]: {content}"
+        your_turn = turn_signal == 'your_turn'
 
         # Try tmux send-keys first (more reliable for TUI apps)
-        if self._try_tmux_sendkeys(message):
-            return
+        if os.environ.get('TMUX_PANE'):
+            turn_marker = "[YOUR TURN] " if your_turn else ""
+            if self._try_tmux_sendkeys(f"{turn_marker}[From {sender}]: {content}"):
+                return
 
         # Fallback to PTY master write
         if self.master_fd is None:
@@ -1073,7 +1390,11 @@ class CSPSidecar:
         # Clear line, write message, send Enter
         os.write(self.master_fd, b'\x15')  # Ctrl+U
         time.sleep(0.02)
-        os.write(self.master_fd, message.encode('utf-8'))
+        # Message as pre-encoded fragments in one scatter-gather write
+        os.writev(self.master_fd, [
+            _INJ_TURN if your_turn else b"", _INJ_FROM, sender.encode('utf-8'),
+            _INJ_SEP, content.encode('utf-8'),
+        ])
         time.sleep(0.05)
         os.write(self.master_fd, b'\r')
 
@@ -1144,9 +1465,8 @@ class CSPSidecar:
         # Attempt to unregister from gateway
         if self.auth_token:
             try:
-                response = requests.delete(
+                response = self._http.delete(
                     f"{self.gateway_url}/agent/{self.agent_id}",
-                    headers={"X-Auth-Token": self.auth_token},
                     timeout=2
                 )
                 if response.status_code == 200:
@@ -235,6 +235,14 @@ class CSPGateway {
     return allowlist.some(re => re.test((content || '').trim()));
   }
 
+  // Queue a message for an agent and complete its pending long-poll, if any
+  enqueueMessage(agent, message) {
+    agent.messageQueue.push(message);
+    if (agent.inboxWaiter) {
+      agent.inboxWaiter();
+    }
+  }
+
   broadcastSystemMessage(content) {
     const message = {
       id: this.generateMessageId(),
@@ -250,7 +258,7 @@ class CSPGateway {
     // Deliver to all agents except orchestrator
     for (const [agentId, agent] of this.agents) {
       if (!agentId.startsWith('orchestrator')) {
-        agent.messageQueue.push(message);
+        this.enqueueMessage(agent, message);
       }
     }
 
@@ -273,7 +281,7 @@ class CSPGateway {
 
     // Only deliver to Human
     if (this.agents.has('Human')) {
-      this.agents.get('Human').messageQueue.push(message);
+      this.enqueueMessage(this.agents.get('Human'), message);
     }
 
     // Also broadcast via WebSocket for Human interface
@@ -317,14 +325,14 @@ class CSPGateway {
     // Route to targets
     if (targetAgent && targetAgent !== 'broadcast') {
       if (this.agents.has(targetAgent)) {
-          this.agents.get(targetAgent).messageQueue.push(message);
+          this.enqueueMessage(this.agents.get(targetAgent), message);
       }
     } else {
       // Broadcast to all agents except sender AND orchestrator
       // Orchestrator only receives heartbeats and direct messages, not broadcasts
       for (const [agentId, agent] of this.agents) {
         if (agentId !== fromAgent && !agentId.startsWith('orchestrator')) {
-          agent.messageQueue.push(message);
+          this.enqueueMessage(agent, message);
         }
       }
     }
@@ -510,10 +518,33 @@ class CSPGateway {
       }
 
       const agent = this.agents.get(agentId);
-      const messages = agent.messageQueue.splice(0); // Drain queue
-      agent.lastSeen = Date.now(); // Update activity
+      const drain = () => {
+        const messages = agent.messageQueue.splice(0); // Drain queue
+        agent.lastSeen = Date.now(); // Update activity
+        res.json(messages);
+      };
 
-      res.json(messages);
+      // Long-poll (?wait=seconds, max 30): hold an empty inbox request until
+      // a message is queued or the wait runs out
+      const wait = Math.min(Number(req.query.wait) || 0, 30);
+      if (wait <= 0 || agent.messageQueue.length > 0) {
+        return drain();
+      }
+
+      if (agent.inboxWaiter) {
+        agent.inboxWaiter(); // Only one held poll per agent; answer the old one
+      }
+      const reply = () => {
+        clearTimeout(timer);
+        if (agent.inboxWaiter === reply) agent.inboxWaiter = null;
+        if (!res.headersSent) drain();
+      };
+      const timer = setTimeout(reply, wait * 1000);
+      agent.inboxWaiter = reply;
+      res.on('close', () => {
+        clearTimeout(timer);
+        if (agent.inboxWaiter === reply) agent.inboxWaiter = null;
+      });
     });
     
     // List all registered agents (for discovery)
@@ -651,7 +682,7 @@ class CSPGateway {
       };
 
       if (this.agents.has(orchId)) {
-        this.agents.get(orchId).messageQueue.push(msg);
+        this.enqueueMessage(this.agents.get(orchId), msg);
       }
 
       const timeSinceResponse = Date.now() - this.lastOrchestratorResponse;
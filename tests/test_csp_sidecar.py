@@ -0,0 +1,78 @@
+"""Tests for @-command detection and stream shutdown in csp_sidecar."""
+import queue
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+try:
+    from csp_sidecar import AgentCommandProcessor, CSPSidecar  # noqa: E402
+except ImportError as e:  # requests / websocket-client, see requirements-dev.txt
+    raise unittest.SkipTest(f'csp_sidecar dependencies missing: {e}')
+
+
+class DetectCommandsTest(unittest.TestCase):
+    def setUp(self):
+        self.processor = AgentCommandProcessor('tester', 'http://localhost:8765', None)
+
+    def detect(self, text: bytes) -> list:
+        return self.processor.detect_commands(text)
+
+    def test_all_does_not_take_the_next_line(self):
+        self.assertEqual(self.detect(b'@all\nnext line text'), [])
+
+    def test_send_does_not_take_the_next_line(self):
+        self.assertEqual(self.detect(b'@send.alice\nhello there'), [])
+
+    def test_query_log_limit_stays_on_its_line(self):
+        self.assertEqual(
+            self.detect(b'@query.log\n5 more'),
+            [('query_log', {'limit': 50, 'from': None, 'to': None})]
+        )
+
+    def test_mode_set_topic_stays_on_its_line(self):
+        self.assertEqual(self.detect(b'@mode.set debate "a\nb"'), [])
+
+    def test_noop_in_any_case_at_a_line_start(self):
+        self.assertEqual(self.detect(b'Noop'), [('noop', {})])
+        self.assertEqual(self.detect(b'output\nnOoP  \nmore'), [('noop', {})])
+        self.assertEqual(self.detect(b'a noop mid-line'), [])
+
+    def test_commands_on_separate_lines(self):
+        self.assertEqual(
+            self.detect(b'@send.alice hi there\n@all hello\n@query.log 5 from=bob\nNOOP\n@mode.set debate "t" --rounds 2'),
+            [
+                ('send_agent', {'target': 'alice', 'message': 'hi there'}),
+                ('send_all', {'message': 'hello'}),
+                ('query_log', {'limit': 5, 'from': 'bob', 'to': None}),
+                ('noop', {}),
+                ('mode_set', {'mode': 'debate', 'topic': 't', 'rounds': 2}),
+            ]
+        )
+
+
+class StreamSenderShutdownTest(unittest.TestCase):
+    def test_sender_stops_without_a_sentinel(self):
+        # Shutdown drops the None sentinel when the queue is full
+        sidecar = CSPSidecar.__new__(CSPSidecar)
+        sidecar._out_queue = queue.Queue(maxsize=2)
+        sidecar.should_exit = False
+        posted = []
+        sidecar._post_stream = posted.append
+        for chunk in ('a', 'b'):
+            sidecar._out_queue.put_nowait(chunk)
+        with self.assertRaises(queue.Full):
+            sidecar._out_queue.put_nowait(None)
+        sidecar.should_exit = True
+
+        sender = threading.Thread(target=sidecar.stream_sender, daemon=True)
+        sender.start()
+        sender.join(timeout=3)
+        self.assertFalse(sender.is_alive())
+        self.assertEqual(posted, ['ab'])
+
+
+if __name__ == '__main__':
+    unittest.main()
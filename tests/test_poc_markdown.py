@@ -0,0 +1,64 @@
+"""strip_markdown in the POC chat UIs must match the original sequential passes."""
+import importlib.util
+import re
+import unittest
+from pathlib import Path
+
+POC_DIR = Path(__file__).resolve().parents[1] / 'archive' / 'poc'
+
+
+def _load(agent: str):
+    spec = importlib.util.spec_from_file_location(f'{agent}_chat', POC_DIR / agent / 'chat.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def reference_strip_markdown(text: str) -> str:
+    """The original one-re.sub-per-construct implementation."""
+    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+    text = re.sub(r'__(.+?)__', r'\1', text)
+    text = re.sub(r'\*(.+?)\*', r'\1', text)
+    text = re.sub(r'(?<!\w)_(.+?)_(?!\w)', r'\1', text)
+    text = re.sub(r'`(.+?)`', r'\1', text)
+    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', text)
+    return text
+
+
+SAMPLES = [
+    '***x***',
+    '___x___',
+    '***bold italic*** plain',
+    'word___x___ and ___x___word',
+    '**bold** and *italic* and `code`',
+    '# Heading\n## Sub heading\nbody text',
+    '### **Title**',
+    '[link](http://example.com) and **[bold link](url)**',
+    '**bold with _italic_ inside**',
+    '*italic with **bold** inside*',
+    'snake_case_name and __dunder__',
+    '_emphasis_ at the start',
+    '- **item**: `value`',
+    '`**not bold**`',
+    'a * b * c',
+    '**a** **b**',
+    'plain text with no markdown at all',
+]
+
+
+class StripMarkdownTest(unittest.TestCase):
+    def assert_matches_reference(self, module):
+        for sample in SAMPLES:
+            with self.subTest(sample=sample):
+                self.assertEqual(module.strip_markdown(sample), reference_strip_markdown(sample))
+
+    def test_claude_matches_reference(self):
+        self.assert_matches_reference(_load('claude'))
+
+    def test_gemini_matches_reference(self):
+        self.assert_matches_reference(_load('gemini'))
+
+
+if __name__ == '__main__':
+    unittest.main()